@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Anomaly Model Compiler
+Builds the Treelite shared library for the trained anomaly detector.
+
+session_monitor.py runs this once in the server process before starting its
+workers, which only load the result, so they never compile concurrently.
+"""
+
+import logging
+import os
+import tempfile
+
+import joblib
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ML_MODEL_PATH = "models/anomaly_detector.pkl"
+# Treelite-compiled anomaly detector, kept outside the mounted models directory
+ML_LIB_PATH = os.getenv('ML_LIB_PATH', 'build/iforest.so')
+
+def library_is_current(model_path: str = ML_MODEL_PATH, lib_path: str = ML_LIB_PATH) -> bool:
+    """Check the compiled library exists and is not older than the model"""
+    return os.path.exists(lib_path) and os.path.getmtime(lib_path) >= os.path.getmtime(model_path)
+
+def compile_model(model_path: str = ML_MODEL_PATH, lib_path: str = ML_LIB_PATH) -> bool:
+    """Compile the trained model to a shared library unless it is current, replacing it atomically"""
+    if not os.path.exists(model_path):
+        logger.info(f"No trained model at {model_path}, skipping compilation")
+        return False
+    if library_is_current(model_path, lib_path):
+        logger.info(f"{lib_path} is up to date")
+        return True
+        
+    import treelite
+    import treelite.sklearn
+    
+    tl_model = treelite.sklearn.import_model(joblib.load(model_path))
+    
+    # Build beside the target so the rename stays on one filesystem
+    lib_dir = os.path.dirname(lib_path) or "."
+    os.makedirs(lib_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".so", dir=lib_dir)
+    os.close(fd)
+    try:
+        tl_model.export_lib(toolchain="gcc", libpath=tmp_path, params={"parallel_comp": 8})
+        os.replace(tmp_path, lib_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+            
+    logger.info(f"Compiled {model_path} to {lib_path}")
+    return True
+
+if __name__ == "__main__":
+    compile_model()
@@ -5,26 +5,43 @@ Handles real-time session monitoring, anti-cheating detection, and alert generat
 """
 
 import asyncio
-import json
+import itertools
 import logging
+import math
 import os
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 
-import redis
+import msgspec
+import orjson
+import redis.asyncio as redis
 import pymongo
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import APIRouter, FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
 import uvicorn
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, WriteConcern
+from pymongo.errors import BulkWriteError
 import numpy as np
+import zstandard
 from sklearn.ensemble import IsolationForest
 import joblib
 
+try:
+    import treelite_runtime
+except ImportError:
+    treelite_runtime = None
+
+from compile_model import ML_LIB_PATH, ML_MODEL_PATH, compile_model, library_is_current
+
+try:
+    # Ahead-of-time build produced by `python anomaly_postprocess.py`
+    from iforest_post import postprocess
+except ImportError:
+    from anomaly_postprocess import postprocess
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,12 +53,61 @@ logger = logging.getLogger(__name__)
 REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
 MONGODB_URL = os.getenv('MONGODB_URL', 'mongodb://localhost:27017')
 NODEJS_BACKEND_URL = os.getenv('NODEJS_BACKEND_URL', 'http://localhost:5000')
+FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:5173')
+HOST = os.getenv('HOST', '0.0.0.0')
+PORT = int(os.getenv('PORT', '8001'))
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '4'))
+WS_MAX_SIZE = int(os.getenv('WS_MAX_SIZE', '65536'))  # Max websocket message bytes
+PUBLISH_COMPRESSION = os.getenv('PUBLISH_COMPRESSION', 'none')  # 'zstd' to compress Redis payloads
 
 # Thresholds
 TAB_SWITCH_THRESHOLD = 3  # Max tab switches per minute
 INACTIVITY_THRESHOLD = 30  # Seconds of inactivity
 HEARTBEAT_TIMEOUT = 10  # Seconds without heartbeat
+TAB_SWITCH_WINDOW_NS = 60 * 1_000_000_000  # Window for TAB_SWITCH_THRESHOLD
 SUSPICIOUS_SCORE_THRESHOLD = 0.7  # ML model threshold
+SESSION_TTL = 300  # Seconds without heartbeat before a session expires
+SESSION_EXPIRY_GRACE = 60  # Extra seconds the hash outlives its expiry sentinel
+ENDED_SESSION_TTL = 60  # Seconds an ended session stays queryable
+
+# Redis session state
+SESSION_KEY_PREFIX = "session:"
+SESSIONS_BY_HEARTBEAT = "sessions:by_heartbeat"
+SESSION_TIME_FIELDS = ("start_time", "last_heartbeat")
+TAB_SWITCH_RING_SUFFIX = ":tab_switches"  # Ring of the latest tab switch times
+TAB_SWITCH_RING_SIZE = TAB_SWITCH_THRESHOLD + 1
+
+# Sentinel keys whose expiry notifications drive timeouts
+HEARTBEAT_SENTINEL_SUFFIX = ":heartbeat"  # Expires HEARTBEAT_TIMEOUT after the last heartbeat
+ALIVE_SENTINEL_SUFFIX = ":alive"  # Expires SESSION_TTL after the last heartbeat
+EXPIRY_SWEEP_INTERVAL = 5  # Seconds between sweeps when Redis can't notify expiries
+
+# Local session arrays, one row per session seen by this worker
+SESSION_CAPACITY = 1024  # Initial rows, doubled when full
+SESSION_ARRAYS = ("_event_count", "_tab_switches", "_risk_score")
+
+# Write batching
+WRITE_BATCH_SIZE = 200  # Max documents per insert_many
+WRITE_FLUSH_INTERVAL = 0.05  # Seconds between buffer flushes
+PUBLISH_BATCH_SIZE = 500  # Max messages per Redis pipeline
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+# Redis payload framing, a version byte followed by the body
+PAYLOAD_RAW = b"\x00"
+PAYLOAD_ZSTD = b"\x01"
+COMPRESSION_MIN_SIZE = 200  # Smaller payloads are published uncompressed
+
+# ML scoring batching
+ML_BATCH_SIZE = 256  # Max rows per model call
+ML_BATCH_INTERVAL = 0.005  # Seconds to collect rows before scoring
+ML_FEATURE_COUNT = 6
+
+# Read-only admin API, the only routes served with CORS
+ADMIN_PATH_PREFIXES = ("/api/sessions/", "/api/admin/")
+
+# Websocket ingestion
+WS_QUEUE_SIZE = 1000  # Max buffered messages per connection
+WS_BATCH_SIZE = 100  # Max messages processed per consumer iteration
 
 class EventType(Enum):
     TAB_SWITCH = "tab_switch"
@@ -55,59 +121,117 @@ class EventType(Enum):
     RIGHT_CLICK = "right_click"
     KEYBOARD_SHORTCUT = "keyboard_shortcut"
 
+# Precomputed value -> member lookup, cheaper than EventType(value)
+_ET_MAP = {member.value: member for member in EventType}
+
 class SecurityLevel(Enum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
     CRITICAL = "critical"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SessionEvent:
     user_id: str
     session_id: str
     event_type: EventType
-    timestamp: datetime
+    timestamp: int  # Unix time in nanoseconds
     metadata: Dict[str, Any]
     device_fingerprint: Optional[str] = None
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
 
-@dataclass
-class SecurityAlert:
+class SecurityAlert(msgspec.Struct, frozen=True):
     alert_id: str
     user_id: str
     session_id: str
     security_level: SecurityLevel
     event_type: EventType
     description: str
-    timestamp: datetime
+    timestamp: int  # Unix time in nanoseconds
     metadata: Dict[str, Any]
     is_resolved: bool = False
 
-class EventData(BaseModel):
+# Alert templates by kind: (security level, %-format description)
+ALERT_TAB_SWITCH = 0
+ALERT_INACTIVITY = 1
+ALERT_HEARTBEAT_TIMEOUT = 2
+ALERT_ML_ANOMALY = 3
+ALERT_SESSION_EXPIRED = 4
+_ALERT_TEMPLATES = (
+    (SecurityLevel.HIGH, "Excessive tab switching detected: %d switches in 1 minute"),
+    (SecurityLevel.MEDIUM, "User inactive for %s seconds"),
+    (SecurityLevel.CRITICAL, "Heartbeat timeout: %s seconds"),
+    (SecurityLevel.HIGH, "ML model flagged suspicious activity (score: %.2f)"),
+    (SecurityLevel.LOW, "Session ended after %d seconds without heartbeat"),
+)
+
+# Alert ID sequence, seeded from start time so IDs stay unique across restarts
+_ALERT_SEQUENCE = itertools.count(time.time_ns())
+
+_EPOCH = datetime(1970, 1, 1)
+
+def _notifies_expired_keys(flags: str) -> bool:
+    """Whether notify-keyspace-events flags publish expired key events"""
+    return "E" in flags and ("x" in flags or "A" in flags)
+
+def _ns_to_datetime(timestamp_ns: Optional[int]) -> Optional[datetime]:
+    """Convert a nanosecond unix timestamp to a naive UTC datetime"""
+    if timestamp_ns is None:
+        return None
+    return _EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+
+class EventData(msgspec.Struct):
     user_id: str
     session_id: str
     event_type: str
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = msgspec.field(default_factory=dict)
     device_fingerprint: Optional[str] = None
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
 
+EVENT_DECODER = msgspec.json.Decoder(EventData)
+
+class AdminCORSMiddleware(CORSMiddleware):
+    """CORS for the admin API paths only, ingest routes pass straight through"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(ADMIN_PATH_PREFIXES):
+            await super().__call__(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
 class SessionMonitor:
     def __init__(self):
         self.app = FastAPI(title="Session Surveillance Microservice")
-        self.redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
-        self.mongo_client = AsyncIOMotorClient(MONGODB_URL)
+        self.redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+        self.mongo_client = AsyncMongoClient(MONGODB_URL, maxPoolSize=100)
         self.db = self.mongo_client.session_monitoring
-        self.active_sessions: Dict[str, Dict] = {}
+        # Events are append-only telemetry, so skip write acknowledgement
+        self.events_col = self.db.get_collection("session_events", write_concern=WriteConcern(w=0))
+        self._event_buffer: List[Dict] = []
+        self._alert_buffer: List[Dict] = []
+        self._flush_event = asyncio.Event()
+        self._publish_queue: asyncio.Queue = asyncio.Queue()
+        self._compressor = zstandard.ZstdCompressor(level=1) if PUBLISH_COMPRESSION == "zstd" else None
+        self._score_queue: asyncio.Queue = asyncio.Queue()
+        self._feature_buffer = np.empty((ML_BATCH_SIZE, ML_FEATURE_COUNT), dtype=np.float32)
+        
+        # Numeric session state mirrored from Redis as parallel arrays
+        self._sid_index: Dict[str, int] = {}
+        self._rows_used = 0  # Rows handed out so far, free or not
+        self._free_rows: List[int] = []
+        self._event_count = np.zeros(SESSION_CAPACITY, dtype=np.int32)
+        self._tab_switches = np.zeros(SESSION_CAPACITY, dtype=np.int32)
+        self._risk_score = np.zeros(SESSION_CAPACITY, dtype=np.float32)
         self.ml_model = self._initialize_ml_model()
+        self.predictor = self._load_ml_predictor()
         
-        # Setup CORS
+        # Setup CORS on the read-only admin API only, ingest is called by the backend
         self.app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],
-            allow_credentials=True,
-            allow_methods=["*"],
+            AdminCORSMiddleware,
+            allow_origins=[FRONTEND_URL],
+            allow_credentials=False,
+            allow_methods=["GET"],
             allow_headers=["*"],
         )
         
@@ -118,9 +242,8 @@ class SessionMonitor:
         """Initialize ML model for anomaly detection"""
         try:
             # Load pre-trained model if exists
-            model_path = "models/anomaly_detector.pkl"
-            if os.path.exists(model_path):
-                return joblib.load(model_path)
+            if os.path.exists(ML_MODEL_PATH):
+                return joblib.load(ML_MODEL_PATH)
             else:
                 # Initialize new model
                 model = IsolationForest(contamination=0.1, random_state=42)
@@ -129,36 +252,68 @@ class SessionMonitor:
             logger.error(f"Failed to initialize ML model: {e}")
             return None
 
+    def _load_ml_predictor(self):
+        """Load the native Treelite predictor built by compile_model.py"""
+        if treelite_runtime is None or not hasattr(self.ml_model, "estimators_"):
+            return None
+        if not library_is_current(ML_MODEL_PATH, ML_LIB_PATH):
+            logger.warning(f"No compiled {ML_LIB_PATH} for {ML_MODEL_PATH}, run compile_model.py; using scikit-learn")
+            return None
+            
+        try:
+            return treelite_runtime.Predictor(ML_LIB_PATH)
+        except Exception as e:
+            logger.error(f"Failed to load ML predictor, using scikit-learn: {e}")
+            return None
+
     def _setup_routes(self):
         """Setup FastAPI routes"""
+        ingest_router = APIRouter()
+        admin_router = APIRouter()
         
-        @self.app.websocket("/ws/session-monitor")
+        @ingest_router.websocket("/ws/session-monitor")
         async def websocket_endpoint(websocket: WebSocket):
             await websocket.accept()
+            queue: asyncio.Queue = asyncio.Queue(maxsize=WS_QUEUE_SIZE)
+            consumer = asyncio.create_task(self._consume_messages(queue))
             try:
                 while True:
-                    data = await websocket.receive_text()
-                    event_data = json.loads(data)
-                    await self.process_event(event_data)
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+                    # Binary frames go to msgspec undecoded, it validates UTF-8 while parsing
+                    data = message.get("bytes")
+                    await queue.put(data if data is not None else message["text"])
             except WebSocketDisconnect:
                 logger.info("WebSocket disconnected")
             except Exception as e:
                 logger.error(f"WebSocket error: {e}")
+            finally:
+                # Let the consumer drain what was already received
+                await queue.put(None)
+                await consumer
 
-        @self.app.post("/api/events")
-        async def receive_event(event: EventData):
+        @ingest_router.post("/api/events")
+        async def receive_event(request: Request):
             """Receive events via REST API"""
             try:
-                await self.process_event(event.dict())
+                event = EVENT_DECODER.decode(await request.body())
+            except msgspec.DecodeError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+                
+            try:
+                await self.process_event_model(event)
                 return {"status": "success", "message": "Event processed"}
             except Exception as e:
                 logger.error(f"Error processing event: {e}")
                 raise HTTPException(status_code=500, detail=str(e))
 
-        @self.app.get("/api/sessions/{session_id}/status")
+        @admin_router.get("/sessions/{session_id}/status")
         async def get_session_status(session_id: str):
             """Get session status and alerts"""
-            session = self.active_sessions.get(session_id)
+            session = self._decode_session(
+                await self.redis_client.hgetall(SESSION_KEY_PREFIX + session_id)
+            )
             if not session:
                 raise HTTPException(status_code=404, detail="Session not found")
             
@@ -166,61 +321,145 @@ class SessionMonitor:
             return {
                 "session_id": session_id,
                 "status": session.get("status", "unknown"),
-                "last_heartbeat": session.get("last_heartbeat"),
+                "last_heartbeat": _ns_to_datetime(session.get("last_heartbeat")),
                 "alerts": alerts,
                 "risk_score": session.get("risk_score", 0.0)
             }
 
-        @self.app.get("/api/admin/sessions")
+        @admin_router.get("/admin/sessions")
         async def get_all_sessions():
             """Get all active sessions for admin dashboard"""
+            session_ids = await self.redis_client.zrange(SESSIONS_BY_HEARTBEAT, 0, -1)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.hgetall(SESSION_KEY_PREFIX + session_id)
+                results = await pipe.execute()
+                
             sessions = []
-            for session_id, session_data in self.active_sessions.items():
+            stale_ids = []
+            for session_id, raw in zip(session_ids, results):
+                session_data = self._decode_session(raw)
+                if not session_data:
+                    stale_ids.append(session_id)
+                    continue
                 alerts = await self.get_session_alerts(session_id)
                 sessions.append({
                     "session_id": session_id,
                     "user_id": session_data.get("user_id"),
                     "status": session_data.get("status"),
-                    "start_time": session_data.get("start_time"),
-                    "last_heartbeat": session_data.get("last_heartbeat"),
+                    "start_time": _ns_to_datetime(session_data.get("start_time")),
+                    "last_heartbeat": _ns_to_datetime(session_data.get("last_heartbeat")),
                     "risk_score": session_data.get("risk_score", 0.0),
                     "alert_count": len(alerts)
                 })
+            if stale_ids:
+                await self.redis_client.zrem(SESSIONS_BY_HEARTBEAT, *stale_ids)
             return {"sessions": sessions}
 
-        @self.app.get("/health")
+        @ingest_router.get("/health")
         async def health_check():
             return {"status": "ok"}
+            
+        self.app.include_router(ingest_router)
+        self.app.include_router(admin_router, prefix="/api")
 
-    async def process_event(self, event_data: Dict[str, Any]):
-        """Process incoming session events"""
+    async def process_event_model(self, event_data: EventData):
+        """Process an already validated event model"""
         try:
-            # Create session event
-            event = SessionEvent(
-                user_id=event_data["user_id"],
-                session_id=event_data["session_id"],
-                event_type=EventType(event_data["event_type"]),
-                timestamp=datetime.utcnow(),
-                metadata=event_data.get("metadata", {}),
-                device_fingerprint=event_data.get("device_fingerprint"),
-                ip_address=event_data.get("ip_address"),
-                user_agent=event_data.get("user_agent")
-            )
+            await self._handle_event(self._build_event(event_data))
             
-            # Store event in MongoDB
+        except Exception as e:
+            logger.error(f"Error processing event: {e}")
+
+    async def process_events(self, batch: List[EventData]):
+        """Process a batch of events, grouping storage and publishing"""
+        events = []
+        for event_data in batch:
+            try:
+                events.append(self._build_event(event_data))
+            except KeyError as e:
+                logger.error(f"Error processing event: unknown event type {e}")
+                
+        # Store events in MongoDB
+        for event in events:
             await self.store_event(event)
             
-            # Update active sessions
-            await self.update_session_state(event)
-            
-            # Analyze for suspicious activity
-            await self.analyze_security(event)
+        # Update active sessions, in arrival order
+        tracked = []
+        for event in events:
+            try:
+                session = await self.update_session_state(event)
+                if session:
+                    tracked.append((event, session))
+            except Exception as e:
+                logger.error(f"Error processing event: {e}")
+                
+        # Queue the whole batch for ML scoring at once instead of one event per wait
+        risk_scores = [None] * len(tracked)
+        if hasattr(self.ml_model, "estimators_"):
+            risk_scores = await asyncio.gather(*(
+                self._calculate_ml_risk_score(event, session) for event, session in tracked
+            ))
             
-            # Publish to Redis for real-time updates
+        # Analyze, in arrival order
+        for (event, session), risk_score in zip(tracked, risk_scores):
+            try:
+                await self.analyze_security(event, session, risk_score)
+            except Exception as e:
+                logger.error(f"Error processing event: {e}")
+                
+        # Publish to Redis for real-time updates
+        for event in events:
             await self.publish_event(event)
-            
-        except Exception as e:
-            logger.error(f"Error processing event: {e}")
+
+    async def _consume_messages(self, queue: asyncio.Queue):
+        """Decode and process queued websocket messages until a None sentinel"""
+        while True:
+            messages = [await queue.get()]
+            while len(messages) < WS_BATCH_SIZE and not queue.empty():
+                messages.append(queue.get_nowait())
+                
+            batch = []
+            for data in messages:
+                if data is None:
+                    continue
+                try:
+                    batch.append(EVENT_DECODER.decode(data))
+                except msgspec.DecodeError as e:
+                    logger.error(f"Invalid event: {e}")
+                    
+            if batch:
+                await self.process_events(batch)
+            if messages[-1] is None:
+                return
+
+    def _build_event(self, event_data: EventData) -> SessionEvent:
+        """Create session event from a validated event model"""
+        return SessionEvent(
+            user_id=event_data.user_id,
+            session_id=event_data.session_id,
+            event_type=_ET_MAP[event_data.event_type],
+            timestamp=time.time_ns(),
+            metadata=event_data.metadata,
+            device_fingerprint=event_data.device_fingerprint,
+            ip_address=event_data.ip_address,
+            user_agent=event_data.user_agent
+        )
+
+    async def _handle_event(self, event: SessionEvent):
+        """Store, track, analyze and publish a session event"""
+        # Store event in MongoDB
+        await self.store_event(event)
+        
+        # Update active sessions
+        session = await self.update_session_state(event)
+        
+        # Analyze for suspicious activity
+        if session:
+            await self.analyze_security(event, session)
+        
+        # Publish to Redis for real-time updates
+        await self.publish_event(event)
 
     async def store_event(self, event: SessionEvent):
         """Store event in MongoDB"""
@@ -229,101 +468,165 @@ class SessionMonitor:
                 "user_id": event.user_id,
                 "session_id": event.session_id,
                 "event_type": event.event_type.value,
-                "timestamp": event.timestamp,
+                "timestamp": _ns_to_datetime(event.timestamp),
                 "metadata": event.metadata,
                 "device_fingerprint": event.device_fingerprint,
                 "ip_address": event.ip_address,
                 "user_agent": event.user_agent
             }
             
-            await self.db.session_events.insert_one(event_doc)
-            logger.info(f"Stored event: {event.event_type.value} for session {event.session_id}")
+            self._event_buffer.append(event_doc)
+            if len(self._event_buffer) >= WRITE_BATCH_SIZE:
+                self._flush_event.set()
             
         except Exception as e:
             logger.error(f"Error storing event: {e}")
 
-    async def update_session_state(self, event: SessionEvent):
-        """Update active session state"""
+    async def update_session_state(self, event: SessionEvent) -> Optional[Dict]:
+        """Update active session state in Redis, returning the updated session"""
         session_id = event.session_id
+        key = SESSION_KEY_PREFIX + session_id
+        heartbeat_score = event.timestamp / 1e9
         
         if event.event_type == EventType.SESSION_START:
-            self.active_sessions[session_id] = {
+            session = {
                 "user_id": event.user_id,
                 "start_time": event.timestamp,
                 "last_heartbeat": event.timestamp,
                 "status": "active",
                 "risk_score": 0.0,
-                "event_count": 0,
-                "tab_switches": 0,
-                "last_tab_switch": None
+                "event_count": 1,
+                "tab_switches": 0
             }
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(key, key + TAB_SWITCH_RING_SUFFIX)
+                pipe.hset(key, mapping=self._encode_session(session))
+                self._touch_session(pipe, session_id, heartbeat_score)
+                await pipe.execute()
+            self._mirror_session(session_id, session)
+            return session
             
-        elif event.event_type == EventType.HEARTBEAT:
-            if session_id in self.active_sessions:
-                self.active_sessions[session_id]["last_heartbeat"] = event.timestamp
+        session = self._decode_session(await self.redis_client.hgetall(key))
+        if not session or session.get("status") == "ended":
+            # Late events must not revive an ended session's TTL or sentinels
+            return None
+            
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            if event.event_type == EventType.HEARTBEAT:
+                session["last_heartbeat"] = event.timestamp
+                pipe.hset(key, "last_heartbeat", event.timestamp)
+                pipe.hdel(key, "heartbeat_alerted")
+                self._touch_session(pipe, session_id, heartbeat_score)
                 
-        elif event.event_type == EventType.SESSION_END:
-            if session_id in self.active_sessions:
-                self.active_sessions[session_id]["status"] = "ended"
+            elif event.event_type == EventType.SESSION_END:
+                session["status"] = "ended"
+                pipe.hset(key, "status", "ended")
+                pipe.expire(key, ENDED_SESSION_TTL)
+                pipe.zrem(SESSIONS_BY_HEARTBEAT, session_id)
+                pipe.delete(key + HEARTBEAT_SENTINEL_SUFFIX, key + ALIVE_SENTINEL_SUFFIX)
                 
-        elif event.event_type == EventType.TAB_SWITCH:
-            if session_id in self.active_sessions:
-                session = self.active_sessions[session_id]
-                session["tab_switches"] += 1
-                session["last_tab_switch"] = event.timestamp
+            elif event.event_type == EventType.TAB_SWITCH:
+                # Bounded list as ring buffer, the last entry is the oldest switch in the ring
+                ring_key = key + TAB_SWITCH_RING_SUFFIX
+                pipe.hincrby(key, "tab_switches", 1)
+                pipe.lpush(ring_key, event.timestamp)
+                pipe.ltrim(ring_key, 0, TAB_SWITCH_RING_SIZE - 1)
+                pipe.lindex(ring_key, TAB_SWITCH_RING_SIZE - 1)
+                pipe.expire(ring_key, SESSION_TTL)
                 
-        # Update event count
-        if session_id in self.active_sessions:
-            self.active_sessions[session_id]["event_count"] += 1
+            # Update event count
+            pipe.hincrby(key, "event_count", 1)
+            # Never leave a hash recreated by a racing expiry without a TTL
+            pipe.expire(key, SESSION_TTL, nx=True)
+            results = await pipe.execute()
+            
+        session["event_count"] = results[-2]
+        if event.event_type == EventType.TAB_SWITCH:
+            session["tab_switches"] = results[0]
+            session["tab_ring_oldest"] = int(results[3]) if results[3] else None
+        self._mirror_session(session_id, session)
+        return session
 
-    async def analyze_security(self, event: SessionEvent):
-        """Analyze event for security threats"""
-        session_id = event.session_id
-        session = self.active_sessions.get(session_id)
-        
-        if not session:
-            return
+    def _touch_session(self, pipe, session_id: str, heartbeat_score: float):
+        """Queue the TTL and sentinel refreshes for a session heartbeat"""
+        key = SESSION_KEY_PREFIX + session_id
+        pipe.expire(key, SESSION_TTL + SESSION_EXPIRY_GRACE)
+        pipe.set(key + HEARTBEAT_SENTINEL_SUFFIX, 1, ex=HEARTBEAT_TIMEOUT)
+        pipe.set(key + ALIVE_SENTINEL_SUFFIX, 1, ex=SESSION_TTL)
+        pipe.zadd(SESSIONS_BY_HEARTBEAT, {session_id: heartbeat_score})
+
+    def _encode_session(self, session: Dict) -> Dict[str, Any]:
+        """Convert session state to Redis hash fields"""
+        return {field: "" if value is None else value for field, value in session.items()}
+
+    def _decode_session(self, fields: Dict[str, str]) -> Optional[Dict]:
+        """Convert Redis hash fields back to session state"""
+        # A racing HINCRBY can recreate a deleted hash with counters only
+        if not fields or "user_id" not in fields:
+            return None
+            
+        session: Dict[str, Any] = dict(fields)
+        session["risk_score"] = float(fields.get("risk_score", 0.0))
+        session["event_count"] = int(fields.get("event_count", 0))
+        session["tab_switches"] = int(fields.get("tab_switches", 0))
+        for field in SESSION_TIME_FIELDS:
+            value = fields.get(field)
+            session[field] = int(value) if value else None
+        return session
+
+    def _mirror_session(self, session_id: str, session: Dict) -> int:
+        """Copy numeric session fields into the local arrays, returning the row"""
+        row = self._sid_index.get(session_id)
+        if row is None:
+            row = self._allocate_session_row(session_id)
             
+        self._event_count[row] = session["event_count"]
+        self._tab_switches[row] = session["tab_switches"]
+        self._risk_score[row] = session["risk_score"]
+        return row
+
+    def _allocate_session_row(self, session_id: str) -> int:
+        """Assign a free array row to a session, growing the arrays when full"""
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = self._rows_used
+            self._rows_used += 1
+            if row == len(self._event_count):
+                for name in SESSION_ARRAYS:
+                    array = getattr(self, name)
+                    setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+                    
+        self._sid_index[session_id] = row
+        return row
+
+    async def analyze_security(self, event: SessionEvent, session: Dict,
+                               risk_score: Optional[float] = None):
+        """Analyze event for security threats, scoring it unless a risk score is given"""
+        previous_risk_score = session["risk_score"]
         alerts = []
         
         # Check for excessive tab switches
         if event.event_type == EventType.TAB_SWITCH:
-            time_window = timedelta(minutes=1)
-            if session["last_tab_switch"]:
-                time_diff = event.timestamp - session["last_tab_switch"]
-                if time_diff < time_window and session["tab_switches"] > TAB_SWITCH_THRESHOLD:
-                    alerts.append(self._create_alert(
-                        event, SecurityLevel.HIGH,
-                        f"Excessive tab switching detected: {session['tab_switches']} switches in 1 minute"
-                    ))
+            oldest_switch = session.get("tab_ring_oldest")
+            if oldest_switch and event.timestamp - oldest_switch < TAB_SWITCH_WINDOW_NS:
+                alerts.append(self._create_alert_fast(event, ALERT_TAB_SWITCH, TAB_SWITCH_RING_SIZE))
         
         # Check for inactivity
         if event.event_type == EventType.INACTIVITY:
             if event.metadata.get("duration", 0) > INACTIVITY_THRESHOLD:
-                alerts.append(self._create_alert(
-                    event, SecurityLevel.MEDIUM,
-                    f"User inactive for {event.metadata.get('duration')} seconds"
-                ))
-        
-        # Check for heartbeat timeout
-        if session["last_heartbeat"]:
-            time_since_heartbeat = datetime.utcnow() - session["last_heartbeat"]
-            if time_since_heartbeat.total_seconds() > HEARTBEAT_TIMEOUT:
-                alerts.append(self._create_alert(
-                    event, SecurityLevel.CRITICAL,
-                    f"Heartbeat timeout: {time_since_heartbeat.total_seconds()} seconds"
+                alerts.append(self._create_alert_fast(
+                    event, ALERT_INACTIVITY, event.metadata.get("duration")
                 ))
         
-        # ML-based anomaly detection
-        if self.ml_model:
-            risk_score = await self._calculate_ml_risk_score(event, session)
+        # ML-based anomaly detection, only once a model has been trained
+        if hasattr(self.ml_model, "estimators_"):
+            if risk_score is None:
+                risk_score = await self._calculate_ml_risk_score(event, session)
             session["risk_score"] = risk_score
             
             if risk_score > SUSPICIOUS_SCORE_THRESHOLD:
-                alerts.append(self._create_alert(
-                    event, SecurityLevel.HIGH,
-                    f"ML model flagged suspicious activity (score: {risk_score:.2f})"
-                ))
+                alerts.append(self._create_alert_fast(event, ALERT_ML_ANOMALY, risk_score))
         
         # Store alerts
         for alert in alerts:
@@ -332,16 +635,23 @@ class SessionMonitor:
         # Update session risk score
         if alerts:
             session["risk_score"] = max(session["risk_score"], 0.8)
+            
+        if session["risk_score"] != previous_risk_score:
+            self._mirror_session(event.session_id, session)
+            await self.redis_client.hset(
+                SESSION_KEY_PREFIX + event.session_id, "risk_score", session["risk_score"]
+            )
 
-    def _create_alert(self, event: SessionEvent, level: SecurityLevel, description: str) -> SecurityAlert:
-        """Create security alert"""
+    def _create_alert_fast(self, event: SessionEvent, kind: int, *args) -> SecurityAlert:
+        """Create security alert from a precomputed template"""
+        level, template = _ALERT_TEMPLATES[kind]
         return SecurityAlert(
-            alert_id=f"alert_{int(time.time())}_{event.session_id}",
+            alert_id=f"alert_{next(_ALERT_SEQUENCE):016x}_{event.session_id}",
             user_id=event.user_id,
             session_id=event.session_id,
             security_level=level,
             event_type=event.event_type,
-            description=description,
+            description=template % args,
             timestamp=event.timestamp,
             metadata=event.metadata
         )
@@ -349,44 +659,136 @@ class SessionMonitor:
     async def _calculate_ml_risk_score(self, event: SessionEvent, session: Dict) -> float:
         """Calculate ML-based risk score"""
         try:
-            # Extract features for ML model
-            features = [
-                session.get("event_count", 0),
-                session.get("tab_switches", 0),
-                session.get("risk_score", 0.0),
-                event.metadata.get("duration", 0),
-                event.metadata.get("click_count", 0),
-                event.metadata.get("keypress_count", 0)
-            ]
-            
-            # Normalize features
-            features = np.array(features).reshape(1, -1)
-            
-            # Get anomaly score (lower = more anomalous)
-            if self.ml_model:
-                score = self.ml_model.decision_function(features)[0]
-                # Convert to risk score (0-1, higher = more risky)
-                risk_score = 1 - (score + 0.5)  # Normalize to 0-1
-                return max(0.0, min(1.0, risk_score))
+            # Event features for ML model, session features are gathered per batch
+            event_features = (
+                float(event.metadata.get("duration", 0)),
+                float(event.metadata.get("click_count", 0)),
+                float(event.metadata.get("keypress_count", 0))
+            )
+            if not all(map(math.isfinite, event_features)):
+                raise ValueError(f"non-finite ML features {event_features}")
+                
+
+            # Score together with other pending events
+            future = asyncio.get_running_loop().create_future()
+            row = self._sid_index[event.session_id]
+            await self._score_queue.put((future, row, event_features))
+            return await future
             
         except Exception as e:
             logger.error(f"Error calculating ML risk score: {e}")
             
         return 0.0
 
+    async def start_scoring_task(self):
+        """Start ML scoring task, running the model once per batch of events"""
+        while True:
+            pending = [await self._score_queue.get()]
+            await asyncio.sleep(ML_BATCH_INTERVAL)
+            while len(pending) < ML_BATCH_SIZE and not self._score_queue.empty():
+                pending.append(self._score_queue.get_nowait())
+                
+            try:
+                rows = np.fromiter((row for _, row, _ in pending), dtype=np.intp, count=len(pending))
+                features = self._feature_buffer[:len(pending)]
+                features[:, 0] = self._event_count[rows]
+                features[:, 1] = self._tab_switches[rows]
+                features[:, 2] = self._risk_score[rows]
+                for i, (_, _, event_features) in enumerate(pending):
+                    features[i, 3:] = event_features
+                    
+                risk_scores = self._risk_scores(features).tolist()
+            except Exception as e:
+                # Fail the whole batch, every waiting event falls back to 0.0
+                for future, _, _ in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+                
+            for (future, _, _), risk_score in zip(pending, risk_scores):
+                if not future.done():
+                    future.set_result(risk_score)
+
+    def _risk_scores(self, features: np.ndarray) -> np.ndarray:
+        """Risk scores for a batch of feature rows (0-1, higher = more risky)"""
+        if self.predictor is None:
+            # Get anomaly scores (lower = more anomalous)
+            scores = self.ml_model.decision_function(features)
+            return np.clip(1 - (scores + 0.5), 0.0, 1.0)
+            
+        # Raw margin is the average path length across trees. Treelite sums
+        # leaf depths in float32, so scores track decision_function to ~0.005
+        avg_path = self.predictor.predict(treelite_runtime.DMatrix(features), pred_margin=True)
+        return postprocess(
+            np.ascontiguousarray(avg_path, dtype=np.float64).ravel(),
+            int(self.ml_model.max_samples_),
+            float(self.ml_model.offset_)
+        )
+
     async def store_alert(self, alert: SecurityAlert):
         """Store security alert in MongoDB"""
         try:
-            alert_doc = asdict(alert)
-            alert_doc["security_level"] = alert.security_level.value
-            alert_doc["event_type"] = alert.event_type.value
+            alert_doc = {
+                "alert_id": alert.alert_id,
+                "user_id": alert.user_id,
+                "session_id": alert.session_id,
+                "security_level": alert.security_level.value,
+                "event_type": alert.event_type.value,
+                "description": alert.description,
+                "timestamp": _ns_to_datetime(alert.timestamp),
+                "metadata": alert.metadata,
+                "is_resolved": alert.is_resolved
+            }
             
-            await self.db.security_alerts.insert_one(alert_doc)
-            logger.warning(f"Security alert stored: {alert.description}")
+            self._alert_buffer.append(alert_doc)
+            if len(self._alert_buffer) >= WRITE_BATCH_SIZE:
+                self._flush_event.set()
+            logger.warning(f"Security alert raised: {alert.description}")
             
         except Exception as e:
             logger.error(f"Error storing alert: {e}")
 
+    async def ensure_indexes(self):
+        """Create MongoDB indexes used by session queries"""
+        session_timeline = [("session_id", pymongo.ASCENDING), ("timestamp", pymongo.DESCENDING)]
+        try:
+            await self.db.session_events.create_index(session_timeline)
+            await self.db.security_alerts.create_index(session_timeline)
+        except Exception as e:
+            logger.error(f"Error creating indexes: {e}")
+
+    async def flush_buffers(self):
+        """Flush buffered events and alerts to MongoDB"""
+        if self._event_buffer:
+            batch, self._event_buffer = self._event_buffer, []
+            await self._insert_batch(self.events_col, batch)
+            
+        if self._alert_buffer:
+            batch, self._alert_buffer = self._alert_buffer, []
+            await self._insert_batch(self.db.security_alerts, batch)
+
+    async def _insert_batch(self, collection, batch: List[Dict]):
+        """Insert a batch of documents, WRITE_BATCH_SIZE per round-trip"""
+        for start in range(0, len(batch), WRITE_BATCH_SIZE):
+            chunk = batch[start:start + WRITE_BATCH_SIZE]
+            try:
+                await collection.insert_many(chunk, ordered=False)
+                logger.info(f"Stored {len(chunk)} documents in {collection.name}")
+            except BulkWriteError as e:
+                logger.error(f"Bulk write error in {collection.name}: {e.details.get('writeErrors', [])[:1]}")
+            except Exception as e:
+                logger.error(f"Error storing batch in {collection.name}: {e}")
+
+    async def start_flush_task(self):
+        """Start periodic write buffer flush task"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=WRITE_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+            await self.flush_buffers()
+
     async def get_session_alerts(self, session_id: str) -> List[Dict]:
         """Get alerts for a specific session"""
         try:
@@ -409,42 +811,235 @@ class SessionMonitor:
                 "user_id": event.user_id,
                 "session_id": event.session_id,
                 "event_type": event.event_type.value,
-                "timestamp": event.timestamp.isoformat(),
+                "timestamp": _ns_to_datetime(event.timestamp),
                 "metadata": event.metadata
             }
             
-            # Publish to Redis channel
-            self.redis_client.publish("session_events", json.dumps(event_data))
+            # Queue for the Redis publisher
+            await self._publish_queue.put(
+                self._frame_payload(orjson.dumps(event_data, option=ORJSON_OPTIONS))
+            )
             
         except Exception as e:
             logger.error(f"Error publishing event: {e}")
 
-    async def cleanup_expired_sessions(self):
-        """Clean up expired sessions"""
-        current_time = datetime.utcnow()
-        expired_sessions = []
+    def _frame_payload(self, payload: bytes) -> bytes:
+        """Prefix the payload version byte, compressing it once for all subscribers"""
+        if self._compressor and len(payload) >= COMPRESSION_MIN_SIZE:
+            return PAYLOAD_ZSTD + self._compressor.compress(payload)
+        return PAYLOAD_RAW + payload
+
+    async def start_publish_task(self):
+        """Start Redis publisher, pipelining all queued messages per round-trip"""
+        while True:
+            batch = [await self._publish_queue.get()]
+            while len(batch) < PUBLISH_BATCH_SIZE and not self._publish_queue.empty():
+                batch.append(self._publish_queue.get_nowait())
+            await self._publish_batch(batch)
+
+    async def flush_publish_queue(self):
+        """Publish every message still queued, in pipelined batches"""
+        while not self._publish_queue.empty():
+            batch = []
+            while len(batch) < PUBLISH_BATCH_SIZE and not self._publish_queue.empty():
+                batch.append(self._publish_queue.get_nowait())
+            await self._publish_batch(batch)
+
+    async def _publish_batch(self, batch: List[bytes]):
+        """Publish a batch of framed payloads in one Redis round-trip"""
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for payload in batch:
+                    pipe.publish("session_events", payload)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error publishing {len(batch)} events: {e}")
+
+    async def start_expiry_listener(self):
+        """Start listener for expired session keys, replacing periodic cleanup"""
+        if not await self._enable_expiry_notifications():
+            logger.warning(
+                "Keyspace notifications not confirmed, set notify-keyspace-events Ex on Redis; "
+                f"sweeping sessions every {EXPIRY_SWEEP_INTERVAL}s instead"
+            )
+            asyncio.create_task(self.start_expiry_sweep())
+            
+        db = self.redis_client.connection_pool.connection_kwargs.get("db", 0)
+        while True:
+            try:
+                async with self.redis_client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"__keyevent@{db}__:expired")
+                    async for message in pubsub.listen():
+                        if message["type"] == "pmessage":
+                            await self._handle_expired_key(message["data"])
+            except Exception as e:
+                logger.error(f"Expiry listener error, resubscribing: {e}")
+                await asyncio.sleep(1)
+
+    async def _enable_expiry_notifications(self) -> bool:
+        """Turn on expired key events, returning whether Redis confirms they are on"""
+        try:
+            config = await self.redis_client.config_get("notify-keyspace-events")
+            flags = config.get("notify-keyspace-events", "")
+            if not _notifies_expired_keys(flags):
+                await self.redis_client.config_set("notify-keyspace-events", flags + "Ex")
+                # Re-read, some servers accept the command without applying it
+                config = await self.redis_client.config_get("notify-keyspace-events")
+                flags = config.get("notify-keyspace-events", "")
+            return _notifies_expired_keys(flags)
+        except Exception as e:
+            logger.warning(f"Could not enable keyspace notifications: {e}")
+            return False
+
+    async def start_expiry_sweep(self):
+        """Start periodic expiry sweep, the fallback when keyspace notifications are off"""
+        while True:
+            await asyncio.sleep(EXPIRY_SWEEP_INTERVAL)
+            try:
+                await self.sweep_expired_sessions()
+            except Exception as e:
+                logger.error(f"Error sweeping expired sessions: {e}")
+
+    async def sweep_expired_sessions(self):
+        """Handle timed out sessions and release local rows of sessions that are gone"""
+        now = time.time()
+        expired_ids = await self.redis_client.zrangebyscore(SESSIONS_BY_HEARTBEAT, "-inf", now - SESSION_TTL)
+        for session_id in expired_ids:
+            await self.handle_session_expired(session_id)
+            
+        # Already alerted sessions are skipped by handle_heartbeat_timeout
+        timed_out_ids = await self.redis_client.zrangebyscore(
+            SESSIONS_BY_HEARTBEAT, now - SESSION_TTL, now - HEARTBEAT_TIMEOUT
+        )
+        for session_id in timed_out_ids:
+            await self.handle_heartbeat_timeout(session_id)
+            
+        # Ended sessions leave the sorted set, release them once their hash expires
+        session_ids = list(self._sid_index)
+        if session_ids:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.exists(SESSION_KEY_PREFIX + session_id)
+                results = await pipe.execute()
+            for session_id, exists in zip(session_ids, results):
+                if not exists:
+                    self._release_session(session_id)
+
+    async def _handle_expired_key(self, key: str):
+        """Dispatch an expired key to its session handler"""
+        if not key.startswith(SESSION_KEY_PREFIX):
+            return
+            
+        try:
+            if key.endswith(HEARTBEAT_SENTINEL_SUFFIX):
+                await self.handle_heartbeat_timeout(key[len(SESSION_KEY_PREFIX):-len(HEARTBEAT_SENTINEL_SUFFIX)])
+            elif key.endswith(ALIVE_SENTINEL_SUFFIX):
+                await self.handle_session_expired(key[len(SESSION_KEY_PREFIX):-len(ALIVE_SENTINEL_SUFFIX)])
+            elif not key.endswith(TAB_SWITCH_RING_SUFFIX):
+                # An ended session's hash expired
+                self._release_session(key[len(SESSION_KEY_PREFIX):])
+        except Exception as e:
+            logger.error(f"Error handling expired key {key}: {e}")
+
+    async def handle_heartbeat_timeout(self, session_id: str):
+        """Raise one alert when a session's heartbeat sentinel expires"""
+        key = SESSION_KEY_PREFIX + session_id
+        user_id, status, risk_score, last_heartbeat = await self.redis_client.hmget(
+            key, "user_id", "status", "risk_score", "last_heartbeat"
+        )
+        if user_id is None or status == "ended":
+            return
+            
+        # Every worker gets the notification, only the one that claims it alerts
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.hsetnx(key, "heartbeat_alerted", 1)
+            pipe.expire(key, SESSION_TTL, nx=True)
+            claimed, _ = await pipe.execute()
+        if not claimed:
+            return
+            
+        now_ns = time.time_ns()
+        event = SessionEvent(
+            user_id=user_id,
+            session_id=session_id,
+            event_type=EventType.HEARTBEAT,
+            timestamp=now_ns,
+            metadata={}
+        )
+        await self.store_alert(self._create_alert_fast(
+            event, ALERT_HEARTBEAT_TIMEOUT, (now_ns - int(last_heartbeat or now_ns)) / 1e9
+        ))
         
-        for session_id, session_data in self.active_sessions.items():
-            if session_data.get("status") == "ended":
-                expired_sessions.append(session_id)
-            elif session_data.get("last_heartbeat"):
-                time_since_heartbeat = current_time - session_data["last_heartbeat"]
-                if time_since_heartbeat.total_seconds() > 300:  # 5 minutes
-                    expired_sessions.append(session_id)
+        if float(risk_score or 0.0) < 0.8:
+            row = self._sid_index.get(session_id)
+            if row is not None:
+                self._risk_score[row] = 0.8
+            await self.redis_client.hset(key, "risk_score", 0.8)
+
+    async def handle_session_expired(self, session_id: str):
+        """Drop a session whose alive sentinel expired and raise a session ended alert"""
+        key = SESSION_KEY_PREFIX + session_id
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.hget(key, "user_id")
+            pipe.delete(key)
+            pipe.delete(key + TAB_SWITCH_RING_SUFFIX, key + HEARTBEAT_SENTINEL_SUFFIX)
+            pipe.zrem(SESSIONS_BY_HEARTBEAT, session_id)
+            user_id, deleted, _, _ = await pipe.execute()
+            
+        self._release_session(session_id)
         
-        for session_id in expired_sessions:
-            del self.active_sessions[session_id]
+        # Only the worker whose DEL removed the hash alerts
+        if deleted and user_id:
+            event = SessionEvent(
+                user_id=user_id,
+                session_id=session_id,
+                event_type=EventType.SESSION_END,
+                timestamp=time.time_ns(),
+                metadata={}
+            )
+            await self.store_alert(self._create_alert_fast(event, ALERT_SESSION_EXPIRED, SESSION_TTL))
             logger.info(f"Cleaned up expired session: {session_id}")
 
-    async def start_cleanup_task(self):
-        """Start periodic cleanup task"""
-        while True:
-            await asyncio.sleep(60)  # Run every minute
-            await self.cleanup_expired_sessions()
+    def _release_session(self, session_id: str):
+        """Drop a session from the local arrays, returning its row to the free list"""
+        row = self._sid_index.pop(session_id, None)
+        if row is not None:
+            self._free_rows.append(row)
+
+if __name__ == "__main__":
+    # Build the model library once in the server process, its workers only load it
+    try:
+        compile_model()
+    except Exception as e:
+        logger.error(f"Failed to compile ML model, using scikit-learn: {e}")
 
 monitor = SessionMonitor()
 app = monitor.app
 
 @app.on_event("startup")
 async def startup_event():
-    asyncio.create_task(monitor.start_cleanup_task()) 
\ No newline at end of file
+    # Build indexes in the background so an unreachable MongoDB can't hold up startup
+    asyncio.create_task(monitor.ensure_indexes())
+    asyncio.create_task(monitor.start_expiry_listener())
+    asyncio.create_task(monitor.start_flush_task())
+    asyncio.create_task(monitor.start_publish_task())
+    if hasattr(monitor.ml_model, "estimators_"):
+        asyncio.create_task(monitor.start_scoring_task())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await monitor.flush_publish_queue()
+    await monitor.flush_buffers()
+
+if __name__ == "__main__":
+    uvicorn.run(
+        "session_monitor:app",
+        host=HOST,
+        port=PORT,
+        workers=WEB_CONCURRENCY,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_max_size=WS_MAX_SIZE,
+        ws_per_message_deflate=False
+    )
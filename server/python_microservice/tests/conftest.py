@@ -0,0 +1,26 @@
+"""
+Shared fixtures for the session monitor tests
+"""
+
+import os
+import sys
+
+import fakeredis
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import session_monitor
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """Session monitor backed by an in-memory Redis, collecting stored alerts"""
+    monitor = session_monitor.SessionMonitor()
+    monitor.redis_client = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+    monitor.alerts = []
+    
+    async def store_alert(alert):
+        monitor.alerts.append(alert)
+        
+    monkeypatch.setattr(monitor, "store_alert", store_alert)
+    return monitor
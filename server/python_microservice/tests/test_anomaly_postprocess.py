@@ -0,0 +1,78 @@
+"""
+Anomaly score kernel against scikit-learn's decision_function
+"""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import IsolationForest
+from sklearn.ensemble._iforest import _average_path_length
+
+from anomaly_postprocess import postprocess
+from compile_model import compile_model
+
+# postprocess redoes decision_function's float64 arithmetic
+POSTPROCESS_TOLERANCE = 1e-9
+# Treelite sums leaf depths in float32, see SessionMonitor._risk_scores
+TREELITE_TOLERANCE = 0.005
+
+@pytest.fixture(scope="module")
+def fitted_model():
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(1000, 6)) * [1, 2, 10, 100, 50, 200]
+    return IsolationForest(contamination=0.1, random_state=42).fit(features)
+
+@pytest.fixture(scope="module")
+def samples():
+    rng = np.random.default_rng(1)
+    return (rng.normal(size=(500, 6)) * [5, 10, 50, 500, 250, 1000]).astype(np.float32)
+
+def expected_risk(model, samples):
+    return np.clip(1 - (model.decision_function(samples) + 0.5), 0.0, 1.0)
+
+def test_postprocess_matches_decision_function(fitted_model, samples):
+    n = int(fitted_model.max_samples_)
+    # score_samples is -2 ** (-avg_path / c(n)), invert it for the average path length
+    avg_path = -_average_path_length([n])[0] * np.log2(-fitted_model.score_samples(samples))
+    
+    risk = postprocess(avg_path, n, float(fitted_model.offset_))
+    
+    np.testing.assert_allclose(risk, expected_risk(fitted_model, samples), rtol=0, atol=POSTPROCESS_TOLERANCE)
+
+def test_postprocess_small_sample_count():
+    risk = postprocess(np.array([0.0, 1.0, 4.0]), 2, -0.5)
+    
+    np.testing.assert_allclose(risk, [1.0, 0.5, 0.0625])
+
+def test_aot_extension_matches_jit(fitted_model):
+    # session_monitor prefers the extension built by `python anomaly_postprocess.py`
+    iforest_post = pytest.importorskip("iforest_post")
+    avg_path = np.linspace(0.0, 20.0, 1001)
+    n = int(fitted_model.max_samples_)
+    offset = float(fitted_model.offset_)
+    
+    np.testing.assert_allclose(
+        iforest_post.postprocess(avg_path, n, offset),
+        postprocess(avg_path, n, offset),
+        rtol=0,
+        atol=POSTPROCESS_TOLERANCE
+    )
+
+def test_compiled_predictor_within_tolerance(fitted_model, samples, tmp_path):
+    treelite_runtime = pytest.importorskip("treelite_runtime")
+    model_path = str(tmp_path / "anomaly_detector.pkl")
+    lib_path = str(tmp_path / "iforest.so")
+    joblib.dump(fitted_model, model_path)
+    
+    assert compile_model(model_path, lib_path)
+    
+    predictor = treelite_runtime.Predictor(lib_path)
+    avg_path = predictor.predict(treelite_runtime.DMatrix(samples), pred_margin=True)
+    risk = postprocess(
+        np.ascontiguousarray(avg_path, dtype=np.float64).ravel(),
+        int(fitted_model.max_samples_),
+        float(fitted_model.offset_)
+    )
+    
+    np.testing.assert_allclose(risk, expected_risk(fitted_model, samples), rtol=0, atol=TREELITE_TOLERANCE)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["anomaly_detector.pkl", "iforest.so"]
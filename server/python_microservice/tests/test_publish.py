@@ -0,0 +1,36 @@
+"""
+Redis publishing of session events
+"""
+
+import time
+
+import orjson
+import pytest
+
+from session_monitor import PAYLOAD_RAW, PUBLISH_BATCH_SIZE, EventType, SessionEvent
+
+@pytest.mark.asyncio
+async def test_flush_publish_queue_drains_everything(monitor):
+    pubsub = monitor.redis_client.pubsub()
+    await pubsub.subscribe("session_events")
+    await pubsub.get_message(timeout=1)  # Subscribe confirmation
+    
+    count = PUBLISH_BATCH_SIZE + 5
+    for i in range(count):
+        await monitor.publish_event(SessionEvent(
+            user_id="user_1",
+            session_id=f"session_{i}",
+            event_type=EventType.HEARTBEAT,
+            timestamp=time.time_ns(),
+            metadata={}
+        ))
+        
+    await monitor.flush_publish_queue()
+    
+    assert monitor._publish_queue.empty()
+    session_ids = []
+    while (message := await pubsub.get_message(timeout=0.1)) is not None:
+        assert message["data"].startswith(PAYLOAD_RAW.decode())
+        session_ids.append(orjson.loads(message["data"][1:])["session_id"])
+    assert session_ids == [f"session_{i}" for i in range(count)]
+    await pubsub.aclose()
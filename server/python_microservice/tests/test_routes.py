@@ -0,0 +1,32 @@
+"""
+Ingest and admin route matching, and admin-only CORS
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from session_monitor import FRONTEND_URL
+
+PREFLIGHT_HEADERS = {"Origin": FRONTEND_URL, "Access-Control-Request-Method": "GET"}
+
+@pytest.fixture
+def client(monitor):
+    return TestClient(monitor.app)
+
+def test_ingest_route_rejects_other_methods(client):
+    assert client.get("/api/events").status_code == 405
+
+def test_ingest_route_has_no_cors(client):
+    response = client.options("/api/events", headers=PREFLIGHT_HEADERS)
+    
+    assert response.status_code == 405
+    assert "access-control-allow-origin" not in response.headers
+
+def test_admin_routes_allow_frontend_origin(client):
+    preflight = client.options("/api/admin/sessions", headers=PREFLIGHT_HEADERS)
+    response = client.get("/api/admin/sessions", headers={"Origin": FRONTEND_URL})
+    
+    assert preflight.status_code == 200
+    assert preflight.headers["access-control-allow-origin"] == FRONTEND_URL
+    assert response.json() == {"sessions": []}
+    assert response.headers["access-control-allow-origin"] == FRONTEND_URL
@@ -0,0 +1,95 @@
+"""
+Session lifecycle in Redis
+"""
+
+import time
+
+import pytest
+
+from session_monitor import (
+    ALERT_HEARTBEAT_TIMEOUT,
+    ALERT_SESSION_EXPIRED,
+    ALIVE_SENTINEL_SUFFIX,
+    ENDED_SESSION_TTL,
+    HEARTBEAT_SENTINEL_SUFFIX,
+    HEARTBEAT_TIMEOUT,
+    SESSION_KEY_PREFIX,
+    SESSION_TTL,
+    SESSIONS_BY_HEARTBEAT,
+    EventType,
+    SessionEvent,
+    _ALERT_TEMPLATES,
+)
+
+SECOND_NS = 1_000_000_000
+START_NS = 1_700_000_000 * SECOND_NS
+KEY = SESSION_KEY_PREFIX + "session_1"
+
+def make_event(event_type: EventType, offset_s: float) -> SessionEvent:
+    return SessionEvent(
+        user_id="user_1",
+        session_id="session_1",
+        event_type=event_type,
+        timestamp=START_NS + int(offset_s * SECOND_NS),
+        metadata={}
+    )
+
+@pytest.mark.asyncio
+async def test_late_heartbeat_does_not_revive_ended_session(monitor):
+    await monitor._handle_event(make_event(EventType.SESSION_START, 0))
+    await monitor._handle_event(make_event(EventType.SESSION_END, 10))
+    
+    assert await monitor.update_session_state(make_event(EventType.HEARTBEAT, 11)) is None
+    
+    redis_client = monitor.redis_client
+    assert await redis_client.hget(KEY, "status") == "ended"
+    assert await redis_client.hget(KEY, "event_count") == "2"
+    assert 0 < await redis_client.ttl(KEY) <= ENDED_SESSION_TTL
+    assert await redis_client.zscore(SESSIONS_BY_HEARTBEAT, "session_1") is None
+    assert not await redis_client.exists(KEY + HEARTBEAT_SENTINEL_SUFFIX, KEY + ALIVE_SENTINEL_SUFFIX)
+
+@pytest.mark.asyncio
+async def test_counter_only_hash_is_not_a_session(monitor):
+    # What a HINCRBY racing the session's deletion leaves behind
+    await monitor.redis_client.hset(KEY, mapping={"event_count": 1, "tab_switches": 1})
+    
+    assert await monitor.update_session_state(make_event(EventType.TAB_SWITCH, 1)) is None
+    assert monitor._decode_session(await monitor.redis_client.hgetall(KEY)) is None
+
+def recent_event(session_id: str, event_type: EventType, age_s: float = 0) -> SessionEvent:
+    return SessionEvent(
+        user_id="user_1",
+        session_id=session_id,
+        event_type=event_type,
+        timestamp=time.time_ns() - int(age_s * SECOND_NS),
+        metadata={}
+    )
+
+@pytest.mark.asyncio
+async def test_unconfirmed_notifications_fall_back_to_sweep(monitor, monkeypatch):
+    async def config_set(*args):
+        raise PermissionError("CONFIG SET is disabled")
+        
+    monkeypatch.setattr(monitor.redis_client, "config_set", config_set)
+    
+    assert not await monitor._enable_expiry_notifications()
+
+@pytest.mark.asyncio
+async def test_sweep_handles_timeouts_and_releases_rows(monitor):
+    await monitor._handle_event(recent_event("fresh", EventType.SESSION_START))
+    await monitor._handle_event(recent_event("silent", EventType.SESSION_START, HEARTBEAT_TIMEOUT + 5))
+    await monitor._handle_event(recent_event("expired", EventType.SESSION_START, SESSION_TTL + 5))
+    await monitor._handle_event(recent_event("ended", EventType.SESSION_START))
+    await monitor._handle_event(recent_event("ended", EventType.SESSION_END))
+    # Stands in for the ended session's hash expiring
+    await monitor.redis_client.delete(SESSION_KEY_PREFIX + "ended")
+    
+    await monitor.sweep_expired_sessions()
+    await monitor.sweep_expired_sessions()  # Alerts are raised once
+    
+    assert [(alert.session_id, alert.security_level) for alert in monitor.alerts] == [
+        ("expired", _ALERT_TEMPLATES[ALERT_SESSION_EXPIRED][0]),
+        ("silent", _ALERT_TEMPLATES[ALERT_HEARTBEAT_TIMEOUT][0]),
+    ]
+    assert set(monitor._sid_index) == {"fresh", "silent"}
+    assert await monitor.redis_client.zrange(SESSIONS_BY_HEARTBEAT, 0, -1) == ["silent", "fresh"]
@@ -0,0 +1,66 @@
+"""
+Tab switch window detection
+"""
+
+import pytest
+
+from session_monitor import (
+    ALERT_TAB_SWITCH,
+    TAB_SWITCH_THRESHOLD,
+    TAB_SWITCH_WINDOW_NS,
+    EventType,
+    SessionEvent,
+    _ALERT_TEMPLATES,
+)
+
+SECOND_NS = 1_000_000_000
+START_NS = 1_700_000_000 * SECOND_NS
+
+def make_event(event_type: EventType, offset_s: float) -> SessionEvent:
+    return SessionEvent(
+        user_id="user_1",
+        session_id="session_1",
+        event_type=event_type,
+        timestamp=START_NS + int(offset_s * SECOND_NS),
+        metadata={}
+    )
+
+async def send_tab_switches(monitor, offsets_s):
+    await monitor._handle_event(make_event(EventType.SESSION_START, 0))
+    for offset_s in offsets_s:
+        await monitor._handle_event(make_event(EventType.TAB_SWITCH, offset_s))
+
+def tab_switch_alerts(monitor):
+    description = _ALERT_TEMPLATES[ALERT_TAB_SWITCH][1] % (TAB_SWITCH_THRESHOLD + 1)
+    return [alert for alert in monitor.alerts if alert.description == description]
+
+@pytest.mark.asyncio
+async def test_switches_within_window_alert(monitor):
+    await send_tab_switches(monitor, [1, 10, 20, 30])
+    
+    alerts = tab_switch_alerts(monitor)
+    assert len(alerts) == 1
+    assert alerts[0].timestamp == START_NS + 30 * SECOND_NS
+
+@pytest.mark.asyncio
+async def test_switches_at_threshold_do_not_alert(monitor):
+    await send_tab_switches(monitor, [1, 2, 3])
+    
+    assert tab_switch_alerts(monitor) == []
+
+@pytest.mark.asyncio
+async def test_switches_spread_past_window_do_not_alert(monitor):
+    offsets_s = [0, 25, 50, 75]
+    assert (offsets_s[-1] - offsets_s[0]) * SECOND_NS > TAB_SWITCH_WINDOW_NS
+    
+    await send_tab_switches(monitor, offsets_s)
+    
+    assert tab_switch_alerts(monitor) == []
+
+@pytest.mark.asyncio
+async def test_window_slides_with_latest_switches(monitor):
+    # The fifth switch brings the last four within a minute of each other
+    await send_tab_switches(monitor, [0, 25, 50, 75, 80])
+    
+    alerts = tab_switch_alerts(monitor)
+    assert [alert.timestamp for alert in alerts] == [START_NS + 80 * SECOND_NS]
@@ -1,8 +1,13 @@
 import { WebSocketServer } from 'ws';
 import Redis from 'ioredis';
 import axios from 'axios';
+import zlib from 'zlib';
 import { logger } from './logger.js';
 
+// Version byte prefixed to payloads published by the Python service
+const PAYLOAD_RAW = 0x00;
+const PAYLOAD_ZSTD = 0x01;
+
 class SessionMonitor {
   constructor() {
     this.wss = null;
@@ -477,9 +482,9 @@ class SessionMonitor {
       logger.info('Subscribed to session events from Python service');
     });
 
-    subscriber.on('message', (channel, message) => {
+    subscriber.on('messageBuffer', (channel, message) => {
       try {
-        const event = JSON.parse(message);
+        const event = JSON.parse(this.decodePythonPayload(message));
         this.handlePythonEvent(event);
       } catch (error) {
         logger.error('Error parsing Redis event:', error);
@@ -487,6 +492,28 @@ class SessionMonitor {
     });
   }
 
+  /**
+   * Decode a framed payload from the Python service
+   */
+  decodePythonPayload(buffer) {
+    const body = buffer.subarray(1);
+    
+    switch (buffer[0]) {
+      case PAYLOAD_RAW:
+        return body.toString('utf8');
+        
+      case PAYLOAD_ZSTD:
+        if (!zlib.zstdDecompressSync) {
+          throw new Error('zstd payloads require Node.js 22.15 or newer');
+        }
+        return zlib.zstdDecompressSync(body).toString('utf8');
+        
+      default:
+        // Unframed JSON from older service versions
+        return buffer.toString('utf8');
+    }
+  }
+
   /**
    * Handle events from Python service
    */